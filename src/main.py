@@ -1,40 +1,68 @@
 import asyncio
 import json
-import contextlib
+import sys
 
-from src.search.engine import SearchEngine
+# Optional: orjson for faster result serialization
+try:
+    import orjson
+except ImportError:  # orjson not installed
+    orjson = None
+
+from src.search.engine import SearchEngine, close_session
 from src.utils import spinner
 
+QUIT_COMMANDS = {"q", "quit", "exit"}
+
 
 # Example usage
-async def search(query: str):
-    async with SearchEngine() as search_engine:
-        spinner_task = asyncio.create_task(spinner("Searching the web..."))
-        try:
-            results = await search_engine.get_search_results(query)
-        finally:
-            spinner_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await spinner_task
-            print()
-        print("Search Results:")
-        print(json.dumps(results, indent=2, default=str))
+async def search(search_engine: SearchEngine, query: str):
+    done = asyncio.Event()
+    spinner_task = asyncio.create_task(spinner("Searching the web...", done))
+    try:
+        results = await search_engine.get_search_results(query, progress=done)
+    finally:
+        done.set()
+        await spinner_task
+        print()
+    print("Search Results:")
+    print_json(results)
+
+
+def print_json(data) -> None:
+    if orjson is None:
+        print(json.dumps(data, indent=2, default=str))
+        return
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC))
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.buffer.flush()
+
+
+async def shutdown(search_engine: SearchEngine):
+    await search_engine.__aexit__(None, None, None)
+    await close_session()
 
 
 def main():
     """Entry point for the web-crawler command line tool."""
-    try:
-        while True:
-            query = input("Enter search query: ").strip()
-            if not query:
-                print("No query entered. Try again or type 'q' to quit.")
-                continue
-            if query.lower() in {"q", "quit", "exit"}:
-                print("Goodbye.")
-                return
-            asyncio.run(search(query))
-    except KeyboardInterrupt:
-        print()
+    # One event loop and SearchEngine serve every query, so caches and pooled
+    # connections stay warm between them. input() stays on the main thread.
+    with asyncio.Runner() as runner:
+        search_engine = runner.run(SearchEngine().__aenter__())
+        try:
+            while True:
+                query = input("Enter search query: ").strip()
+                if not query:
+                    print("No query entered. Try again or type 'q' to quit.")
+                    continue
+                if query.lower() in QUIT_COMMANDS:
+                    print("Goodbye.")
+                    return
+                runner.run(search(search_engine, query))
+        except (KeyboardInterrupt, EOFError):
+            print()
+        finally:
+            runner.run(shutdown(search_engine))
 
 
 if __name__ == "__main__":
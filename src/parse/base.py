@@ -1,84 +1,265 @@
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
 from urllib.parse import urljoin
-import time
+
+import aiohttp
+from bs4 import BeautifulSoup
 
 # Optional: Playwright for JS-rendered pages
 try:
-    from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
 except ImportError:  # Playwright not installed
-    sync_playwright = None
+    async_playwright = None
+
+# Optional: readability-lxml to extract articles in Python rather than in the page
+try:
+    from readability import Document
+except ImportError:  # readability-lxml not installed
+    Document = None
+
+logger = logging.getLogger(__name__)
+
+# Mozilla Readability, shipped with the package and pinned by hash so a modified copy is never injected
+READABILITY_PATH = Path(__file__).resolve().parent / "vendor" / "Readability.js"
+READABILITY_SHA256 = "aee94c69b1c7913f5b9d97a5f81a632e59ea8c4b58d9b7a0676fb87fab37aad6"
+
+def _load_readability_script() -> str | None:
+    """Return the vendored Readability.js, or None if it is missing or doesn't match the pinned hash."""
+    try:
+        data = READABILITY_PATH.read_bytes()
+    except OSError as e:
+        logger.warning("Readability.js unavailable: %s", e)
+        return None
+    if hashlib.sha256(data).hexdigest() != READABILITY_SHA256:
+        logger.warning("Readability.js at %s doesn't match the pinned hash; not injecting it", READABILITY_PATH)
+        return None
+    return data.decode("utf-8")
 
 class BasePageParser:
-    def __init__(self):
+    USER_AGENT = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+    )
+
+    # Shorter plain-HTTP extractions are treated as client-rendered and retried with Playwright
+    MIN_FAST_CONTENT_LENGTH = 500
+    # Consent/continue overlays, combined into one selector so they're probed in a single call
+    CONSENT_SELECTOR = ", ".join([
+        "button:has-text('Continue')",
+        "button:has-text('I agree')",
+        "button:has-text('Accept')",
+        ":text('Continue reading')",
+    ])
+    # Upper bound on waiting for a rendered page to settle before extracting
+    SETTLE_TIMEOUT_MS = 2000
+    # Fallback containers for the main text, most specific first
+    SELECTOR_CASCADE = [
+        "article",
+        "main",
+        "[role='main']",
+        "div[itemprop='articleBody']",
+        "#main-content",
+        "#content",
+        "body",
+    ]
+
+    def __init__(self, max_concurrency: int = 5):
         self.visited_links = set()
+        # Playwright driver and browser are launched lazily and reused across URLs
+        self._pw = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+        self._readability_js: str | None = None
+        self._session: aiohttp.ClientSession | None = None
+        # Bound the number of pages rendered at once on the shared browser
+        self._sem = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self):
+        # The browser is launched on first use, so plain-HTTP pages never pay for it
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Close the shared browser, the HTTP session and stop the Playwright driver."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+    async def _ensure_browser(self):
+        if async_playwright is None:
+            raise RuntimeError("Playwright is not installed. Install with 'pip install playwright' or add to pyproject and sync.")
+        async with self._browser_lock:
+            if self._browser is None:
+                self._pw = await async_playwright().start()
+                try:
+                    self._browser = await self._pw.chromium.launch(headless=True)
+                except Exception:
+                    await self._pw.stop()
+                    self._pw = None
+                    raise
+        return self._browser
 
+    async def _new_context(self):
+        """Open a fresh, isolated browser context on the shared browser."""
+        browser = await self._ensure_browser()
+        return await browser.new_context(user_agent=self.USER_AGENT)
 
-    def get_content(self, url) -> dict:
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers={"User-Agent": self.USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=15, connect=5),
+            )
+        return self._session
+
+    async def _get_readability_script(self) -> str | None:
+        """Return the vendored Readability.js source, read and verified once per parser."""
+        if self._readability_js is None:
+            # File I/O runs in a worker thread so it never stalls the event loop
+            self._readability_js = await asyncio.to_thread(_load_readability_script)
+        return self._readability_js
+
+    async def get_content(self, url) -> dict:
         """
         Returns the text content from the given URL
         """
-        content_data = self._get_content_with_playwright(url)
-        
+        async with self._sem:
+            content_data = None
+            html = await self._fast_fetch(url)
+            if html:
+                content_data = await asyncio.to_thread(self._parse_content_html, html)
+            too_short = content_data is None or len(content_data["content"]) < self.MIN_FAST_CONTENT_LENGTH
+            # Without Playwright, a short plain-HTTP extraction beats raising
+            if too_short and (content_data is None or async_playwright is not None):
+                content_data = await self._get_content_with_playwright(url)
+
         output = {
             "url": url,
             "title": content_data["title"],
             "content": content_data["content"],
             "content_length": len(content_data["content"])
         }
-        
+
         return output
 
-    def get_links(self, url) -> dict:
+    async def get_links(self, url) -> dict:
         """
         Returns all links found on the page
         """
+        async with self._sem:
+            links = None
+            html = await self._fast_fetch(url)
+            if html:
+                links = await asyncio.to_thread(self._parse_links_html, url, html)
+            if not links:
+                links = await self._get_links_with_playwright(url)
         return {
             "url": url,
-            "internal_links": self._get_links_with_playwright(url),
+            "internal_links": sorted(links),
         }
 
-    def _get_content_with_playwright(self, url):
+    async def _fast_fetch(self, url) -> str | None:
+        """Fetch raw HTML over plain HTTP, or None if the page isn't usable HTML."""
+        try:
+            async with self._get_session().get(url) as response:
+                if response.status != 200 or "html" not in response.content_type:
+                    return None
+                return await response.text()
+        except Exception:
+            return None
+
+    def _parse_content_html(self, html: str) -> dict:
+        """Extract title and main text from server-rendered HTML."""
+        soup = BeautifulSoup(html, "html.parser")
+        title = soup.title.get_text() if soup.title else ""
+        for tag in soup(["script", "style", "noscript"]):
+            tag.decompose()
+
+        content = ""
+        if Document is not None:
+            try:
+                content = self._extract_article_text(html)
+            except Exception:
+                content = ""
+            if content.strip():
+                return {"title": title.strip(), "content": ' '.join(content.split())}
+
+        # The whole body is too noisy for the fast path; Playwright handles that case
+        for sel in self.SELECTOR_CASCADE[:-1]:
+            el = soup.select_one(sel)
+            if el is not None:
+                content = el.get_text(" ")
+                if content.strip():
+                    break
+
+        return {"title": title.strip(), "content": ' '.join(content.split())}
+
+    def _parse_links_html(self, url, html: str) -> set[str]:
+        """Return all absolute href links from server-rendered HTML."""
+        soup = BeautifulSoup(html, "html.parser")
+        return self._normalize_links(url, [a.get("href") for a in soup.select("a[href]")])
+
+    async def _wait_until_settled(self, page):
+        """
+        Wait until the network goes idle or the main content container appears, whichever
+        comes first. Ad- and analytics-heavy pages never go idle, so both waits are capped.
+        """
+        waits = [
+            asyncio.ensure_future(page.wait_for_load_state("networkidle", timeout=self.SETTLE_TIMEOUT_MS)),
+            asyncio.ensure_future(page.wait_for_selector(self.SELECTOR_CASCADE[0], timeout=self.SETTLE_TIMEOUT_MS)),
+        ]
+        try:
+            await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for wait in waits:
+                wait.cancel()
+            # Timeouts and cancellations are expected here; retrieve them so they aren't logged
+            await asyncio.gather(*waits, return_exceptions=True)
+
+    async def _get_content_with_playwright(self, url):
         """Extract readable article text using robust, generic Playwright strategy.
         Steps:
-        - Load with domcontentloaded and a short wait
+        - Load with domcontentloaded, then wait briefly for the network to go idle or the article to render
         - Dismiss consent/continue overlays if present
         - Auto-scroll to load lazy content
-        - Use Mozilla Readability in-page to extract main article text
+        - Extract the main article with readability-lxml on the page HTML
+          (or Mozilla Readability in-page when readability-lxml isn't installed)
         - Fallback to semantic selectors, then body inner_text
         """
-        if sync_playwright is None:
-            raise RuntimeError("Playwright is not installed. Install with 'pip install playwright' or add to pyproject and sync.")
+        context = await self._new_context()
+        try:
+            # Without readability-lxml, preload Readability.js into every document instead
+            if Document is None:
+                readability_script = await self._get_readability_script()
+                if readability_script:
+                    await context.add_init_script(script=readability_script)
 
-        user_agent = (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
-        )
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(user_agent=user_agent)
-            page = context.new_page()
-            page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            time.sleep(1.5)
-
-            # Try to click common consent/continue buttons if visible
-            for selector in [
-                "button:has-text('Continue')",
-                "button:has-text('Continue reading')",
-                "button:has-text('I agree')",
-                "button:has-text('Accept')",
-                "text=Continue reading",
-            ]:
-                try:
-                    el = page.query_selector(selector)
-                    if el:
-                        el.click(timeout=1000)
-                        time.sleep(0.5)
-                except Exception:
-                    pass
+            page = await context.new_page()
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            await self._wait_until_settled(page)
+
+            # Try to click a common consent/continue button if present, probing all variants at once
+            try:
+                consent = page.locator(self.CONSENT_SELECTOR).first
+                if await consent.count():
+                    await consent.click(timeout=1000)
+                    await asyncio.sleep(0.5)
+            except Exception:
+                pass
 
             # Auto-scroll to load lazy content
             try:
-                page.evaluate("""
+                await page.evaluate("""
                     async () => {
                         await new Promise((resolve) => {
                             let total = 0; const step = Math.max(200, Math.floor(window.innerHeight * 0.75));
@@ -95,120 +276,126 @@ class BasePageParser:
             except Exception:
                 pass
 
-            # Give dynamic content a moment to render
-            time.sleep(1.5)
+            # Let content loaded by the scroll finish rendering
+            try:
+                await page.wait_for_function("document.readyState === 'complete'", timeout=5000)
+            except Exception:
+                pass
 
-            title = page.title()
+            title = await page.title()
 
-            # Inject Mozilla Readability and extract main article if possible
+            # Extract main article with Readability if possible
             article_text = None
-            try:
-                readability_js = """
-                (() => {
-                  function loadReadability(cb){
-                    if (window.__readabilityLoaded) return cb();
-                    const s=document.createElement('script');
-                    s.src='https://cdn.jsdelivr.net/npm/@mozilla/readability@0.5.0/Readability.js';
-                    s.onload=()=>{window.__readabilityLoaded=true; cb();};
-                    document.head.appendChild(s);
-                  }
-                  return new Promise((resolve)=>{
-                    loadReadability(()=>{
-                      try {
-                        const doc = document.cloneNode(true);
-                        const article = new window.Readability(doc).parse();
-                        resolve(article && article.textContent ? article.textContent : "");
-                      } catch(e){ resolve(""); }
-                    });
-                  });
-                })()
-                """
-                article_text = page.evaluate(readability_js)
-            except Exception:
-                article_text = None
+            if Document is not None:
+                try:
+                    html = await page.content()
+                    article_text = await asyncio.to_thread(self._extract_article_text, html)
+                except Exception:
+                    article_text = None
+            else:
+                article_text = await self._extract_article_text_in_page(page)
 
             content = None
             if article_text and isinstance(article_text, str) and article_text.strip():
                 content = article_text
             else:
-                # Fallback selectors
-                for sel in [
-                    "article",
-                    "main",
-                    "[role='main']",
-                    "div[itemprop='articleBody']",
-                    "#main-content",
-                    "#content",
-                    "body"
-                ]:
-                    try:
-                        content = page.inner_text(sel)
-                        if content and content.strip():
-                            break
-                    except Exception:
-                        continue
-
-            browser.close()
+                # Fallback selectors, resolved in a single in-page call
+                try:
+                    content = await page.evaluate(
+                        """(sels) => {
+                            for (const s of sels) {
+                                const el = document.querySelector(s);
+                                if (el && el.innerText.trim()) return el.innerText;
+                            }
+                            return '';
+                        }""",
+                        self.SELECTOR_CASCADE,
+                    )
+                except Exception:
+                    content = None
+        finally:
+            await context.close()
 
         content = ' '.join((content or '').split())
         title = (title or '').strip()
         return {"title": title, "content": content}
 
-    def _get_links_with_playwright(self, url):
-        """Render a page with JavaScript and return all absolute href links.
+    def _extract_article_text(self, html: str) -> str:
+        """Run readability-lxml over the page HTML and return the article's plain text."""
+        summary_html = Document(html).summary(html_partial=True)
+        return BeautifulSoup(summary_html, "html.parser").get_text(" ")
 
-        """
-        if sync_playwright is None:
-            raise RuntimeError("Playwright is not installed. Install with 'pip install playwright' or add to pyproject and sync.")
+    async def _extract_article_text_in_page(self, page) -> str | None:
+        """Run the preloaded Mozilla Readability inside the page."""
+        try:
+            readability_js = """
+            (() => {
+              try {
+                const article = new Readability(document.cloneNode(true)).parse();
+                return article && article.textContent ? article.textContent : "";
+              } catch(e){ return ""; }
+            })()
+            """
+            return await page.evaluate(readability_js)
+        except Exception:
+            return None
 
-        user_agent = (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
-        )
+    async def _get_links_with_playwright(self, url):
+        """Render a page with JavaScript and return all absolute href links.
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(user_agent=user_agent)
-            page = context.new_page()
-            page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            # Wait 5 seconds for dynamic content to load instead of waiting for networkidle
-            time.sleep(5)
+        """
+        context = await self._new_context()
+        try:
+            page = await context.new_page()
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            # Wait until at least one link is attached instead of sleeping a fixed amount
+            try:
+                await page.wait_for_selector("a[href]", state="attached", timeout=5000)
+            except Exception:
+                pass
 
-            hrefs = page.eval_on_selector_all(
+            hrefs = await page.eval_on_selector_all(
                 "a[href]",
                 "els => els.map(a => a.getAttribute('href'))",
             )
+        finally:
+            await context.close()
 
-            browser.close()
+        return self._normalize_links(url, hrefs)
 
-        normalized = []
+    def _normalize_links(self, url, hrefs) -> set[str]:
+        """Resolve hrefs against `url` into a deduplicated set of absolute links."""
+        seen = set()
         for href in hrefs:
             if not href:
                 continue
             h = href.strip()
-            if h.startswith("javascript:") or h.startswith("mailto:") or h.startswith("#"):
+            if h.startswith(("javascript:", "mailto:", "#")):
                 continue
-            normalized.append(urljoin(url, h))
+            # Absolute links don't need urljoin's parsing
+            seen.add(h if h.startswith(("http://", "https://")) else urljoin(url, h))
 
-        return sorted(set(normalized))
+        return seen
 
-if __name__ == "__main__":
+async def main():
     url = "https://www.cnbc.com/2025/07/31/apple-aapl-q3-earnings-report-2025.html"
-    parser = BasePageParser()
-    
-    print("=== Testing Link Extraction ===")
-    try:
-        links = parser.get_links(url)
-        print(f"Found {len(links['internal_links'])} links")
-        print(f"First 5 links: {links['internal_links'][:5]}")
-    except Exception as e:
-        print(f"Link extraction failed: {e}")
-    
-    print("\n=== Testing Content Extraction ===")
-    try:
-        content = parser.get_content(url)
-        print(f"Title: {content['title']}")
-        print(f"Content length: {content['content_length']} characters")
-        print(f"First 300 characters: {content['content'][:300]}...")
-    except Exception as e:
-        print(f"Content extraction failed: {e}")
+    async with BasePageParser() as parser:
+        print("=== Testing Link Extraction ===")
+        try:
+            links = await parser.get_links(url)
+            print(f"Found {len(links['internal_links'])} links")
+            print(f"First 5 links: {links['internal_links'][:5]}")
+        except Exception as e:
+            print(f"Link extraction failed: {e}")
+
+        print("\n=== Testing Content Extraction ===")
+        try:
+            content = await parser.get_content(url)
+            print(f"Title: {content['title']}")
+            print(f"Content length: {content['content_length']} characters")
+            print(f"First 300 characters: {content['content'][:300]}...")
+        except Exception as e:
+            print(f"Content extraction failed: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
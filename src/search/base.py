@@ -1,9 +1,63 @@
+import html
+import io
+import logging
 import re
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from typing import List
 from pydantic import BaseModel
 
+from .ratelimit import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Optional: lxml (libxml2) for faster RSS parsing, falling back to the stdlib parser
+try:
+    from lxml import etree as ET
+    _HAS_LXML = True
+except ImportError:  # lxml not installed
+    from xml.etree import ElementTree as ET
+    _HAS_LXML = False
+
+def _iterparse_items(source):
+    """Yield (event, element) for each completed <item> in an RSS stream."""
+    if _HAS_LXML:
+        # Feeds are untrusted input, so never expand external entities
+        return ET.iterparse(source, events=('end',), tag='item', resolve_entities=False, no_network=True)
+    return ET.iterparse(source, events=('end',))
+
+def _item_pull_parser():
+    """Return a feed()-driven parser reporting completed <item> elements."""
+    if _HAS_LXML:
+        return ET.XMLPullParser(events=('end',), tag='item', resolve_entities=False, no_network=True)
+    return ET.XMLPullParser(events=('end',))
+
+# Bytes read from the response per parser feed
+RSS_CHUNK_SIZE = 8192
+
+_TAG_RE = re.compile(r'<[^>]+>')
+# Each pattern implies its strptime format
+_DATE_PATTERNS = [
+    (re.compile(r'(\d{4}-\d{2}-\d{2})'), '%Y-%m-%d'),
+    (re.compile(r'(\d{1,2}/\d{1,2}/\d{4})'), '%m/%d/%Y'),
+    (re.compile(r'(\w+ \d{1,2}, \d{4})'), '%B %d, %Y'),
+]
+# Typographic characters mapped to ASCII equivalents, applied in a single translate pass
+_UNICODE_TABLE = str.maketrans({
+    '\u2018': "'",
+    '\u2019': "'",
+    '\u201c': '"',
+    '\u201d': '"',
+    '\u2013': '-',
+    '\u2014': '-',
+    '\u2026': '...',
+    '\u00a0': ' ',
+    '\u00ae': '(R)',
+    '\u2122': '(TM)',
+})
+
 class SearchResult(BaseModel):
     title: str
     url: str
@@ -13,97 +67,122 @@ class SearchResult(BaseModel):
 class BaseSearcher(ABC):
     """Abstract base class for RSS-based pluggable searchers with common utilities."""
 
+    # Shared limiter for outbound requests; searchers run unthrottled without one
+    limiter: HostRateLimiter | None = None
+
     @abstractmethod
     async def get_search_results(self, query: str, max_results: int) -> List[SearchResult]:
         """Search the source represented by this plugin."""
         pass
 
-    # Common RSS utilities
-    def parse_rss_content(self, xml_content: str, max_results: int) -> List[SearchResult]:
-        try:
-            from xml.etree import ElementTree as ET
-            root = ET.fromstring(xml_content)
-            results: List[SearchResult] = []
+    def _limit(self, host: str):
+        """Context manager that waits for a request slot to `host`."""
+        if self.limiter is None:
+            return nullcontext()
+        return self.limiter.limit(host)
 
-            items = root.findall('.//item')[:max_results * 2]
+    # Common RSS utilities
+    def parse_rss_content(self, xml_content: str | bytes, max_results: int) -> List[SearchResult]:
+        # Raw response bytes go straight to the parser; only decoded text needs encoding
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode('utf-8')
+        return self.parse_rss_bytes(xml_content, max_results)
 
-            for item in items:
-                title_elem = item.find('title')
-                link_elem = item.find('link')
-                date_elem = item.find('pubDate')
+    def parse_rss_bytes(self, xml_bytes: bytes, max_results: int) -> List[SearchResult]:
+        """
+        Stream-parse a raw RSS payload, stopping once `max_results` items are read.
+        The parser decodes it using the XML declaration's encoding.
+        """
+        results: List[SearchResult] = []
+        try:
+            self._collect_items(_iterparse_items(io.BytesIO(xml_bytes)), results, max_results)
+        except ET.ParseError as e:
+            # Keep whatever items were read before the malformed part
+            logger.debug("RSS parse error after %d items: %s", len(results), e)
+        return results
 
-                title = title_elem.text if title_elem is not None else "No title"
-                url = link_elem.text if link_elem is not None else ""
-                pub_date = date_elem.text if date_elem is not None else ""
+    async def parse_rss_response(self, response, max_results: int) -> List[SearchResult]:
+        """
+        Parse an RSS response while it downloads, stopping once `max_results` items are read.
+        The rest of the body is still read, unparsed, so the connection can return to the pool.
+        """
+        results: List[SearchResult] = []
+        parser = _item_pull_parser()
+        done = False
+        async for chunk in response.content.iter_chunked(RSS_CHUNK_SIZE):
+            if done:
+                continue
+            try:
+                parser.feed(chunk)
+                done = self._collect_items(parser.read_events(), results, max_results)
+            except ET.ParseError as e:
+                # Keep whatever items were read before the malformed part
+                logger.debug("RSS parse error after %d items: %s", len(results), e)
+                done = True
+        if not done:
+            try:
+                parser.close()
+                self._collect_items(parser.read_events(), results, max_results)
+            except ET.ParseError as e:
+                logger.debug("RSS parse error after %d items: %s", len(results), e)
+        return results
 
-                results.append(
-                    SearchResult(
-                        title=self.clean_text(title),
-                        url=url,
-                        published_date=self.parse_rss_date(pub_date),
-                        searcher=self.searcher,
-                    )
-                )
+    def _collect_items(self, events, results: List[SearchResult], max_results: int) -> bool:
+        """Append parsed <item> elements from `events` to `results`; True once `max_results` is reached."""
+        for _, elem in events:
+            if elem.tag != 'item':
+                continue
+            results.append(self._parse_rss_item(elem))
+            # Drop the parsed subtree so memory stays flat on large feeds
+            elem.clear()
+            if len(results) >= max_results:
+                return True
+        return False
 
-                if len(results) >= max_results:
-                    break
+    def _parse_rss_item(self, item) -> SearchResult:
+        title_elem = item.find('title')
+        link_elem = item.find('link')
+        date_elem = item.find('pubDate')
 
-            return results
+        title = (title_elem.text if title_elem is not None else None) or "No title"
+        url = (link_elem.text if link_elem is not None else None) or ""
+        pub_date = (date_elem.text if date_elem is not None else None) or ""
 
-        except ET.ParseError:
-            return []
+        return SearchResult(
+            title=self.clean_text(title),
+            url=url,
+            published_date=self.parse_rss_date(pub_date),
+            searcher=self.searcher,
+        )
 
     def parse_rss_date(self, date_str: str) -> datetime | None:
         if not date_str:
             return None
+        # RFC 822 dates, timezone included; feeds with other formats fall back to parse_date
         try:
-            date_str = date_str.replace(' GMT', '').replace(' +0000', '')
-            return datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S')
-        except Exception:
+            return parsedate_to_datetime(date_str)
+        except (TypeError, ValueError):
             return self.parse_date(date_str)
 
     def clean_text(self, text: str) -> str:
         if not text:
             return text
-        text = re.sub(r'<[^>]+>', '', text)
-        import html
+        text = _TAG_RE.sub('', text)
         text = html.unescape(text)
-        unicode_replacements = {
-            '\u2018': "'",
-            '\u2019': "'",
-            '\u201c': '"',
-            '\u201d': '"',
-            '\u2013': '-',
-            '\u2014': '-',
-            '\u2026': '...',
-            '\u00a0': ' ',
-            '\u00ae': '(R)',
-            '\u2122': '(TM)',
-        }
-        for unicode_char, replacement in unicode_replacements.items():
-            text = text.replace(unicode_char, replacement)
-        text = text.encode('ascii', 'ignore').decode('ascii')
-        text = ' '.join(text.split())
-        return text
+        text = text.translate(_UNICODE_TABLE)
+        # Most titles are plain ASCII after translate; skip the encode round-trip for them
+        if not text.isascii():
+            text = text.encode('ascii', 'ignore').decode('ascii')
+        return ' '.join(text.split())
 
     def parse_date(self, date_str: str) -> datetime | None:
         if not date_str:
             return None
-        patterns = [
-            r'(\d{4}-\d{2}-\d{2})',
-            r'(\d{1,2}/\d{1,2}/\d{4})',
-            r'(\w+ \d{1,2}, \d{4})',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, date_str)
+        for pattern, fmt in _DATE_PATTERNS:
+            match = pattern.search(date_str)
             if match:
                 try:
-                    date_part = match.group(1)
-                    for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%B %d, %Y']:
-                        try:
-                            return datetime.strptime(date_part, fmt)
-                        except ValueError:
-                            continue
-                except Exception:
-                    pass
+                    return datetime.strptime(match.group(1), fmt)
+                except ValueError:
+                    continue
         return None 
\ No newline at end of file
@@ -1,42 +1,37 @@
 import aiohttp
 from .base import BaseSearcher, SearchResult
+from .ratelimit import HostRateLimiter
 
 class BingNewsSearcher(BaseSearcher):
     """
     RSS-based searcher for Bing News.
     """
 
-    def __init__(self, session: aiohttp.ClientSession):
+    def __init__(self, session: aiohttp.ClientSession, limiter: HostRateLimiter | None = None):
         self.session = session
+        self.limiter = limiter
 
     @property
     def searcher(self) -> str:
         return "Bing News"
 
+    @property
+    def host(self) -> str:
+        return "www.bing.com"
+
     async def get_search_results(self, query: str, max_results: int) -> list[SearchResult]:
         # Build Bing News RSS URL
         encoded_query = query.replace(" ", "+")
         search_url = f"https://www.bing.com/news/search?q={encoded_query}&format=RSS"
 
-        async with self.session.get(search_url) as response:
-            if response.status != 200:
-                return []
-            xml_content = await response.text()
-
-            # Reuse shared RSS parsing logic from BaseSearcher
-            results = self.parse_rss_content(xml_content, max_results)
+        async with self._limit(self.host):
+            async with self.session.get(search_url) as response:
+                if response.status != 200:
+                    return []
+                # Parse items as the body streams in, and stop reading once we have enough
+                results = await self.parse_rss_response(response, max_results)
 
-            # Bing doesn’t use redirect wrappers like Google News,
-            # so we can return results directly.
-            final: list[SearchResult] = []
-            for r in results:
-                final.append(
-                    SearchResult(
-                        title=r.title,
-                        url=r.url,
-                        published_date=r.published_date,
-                        searcher=self.searcher,
-                    )
-                )
-            return final
+        # Bing doesn’t use redirect wrappers like Google News,
+        # so we can return results directly.
+        return results
     
@@ -0,0 +1,70 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path("~/.cache/web-crawler/search-cache.sqlite3").expanduser()
+
+class DiskCache:
+    """
+    Small persistent key/value store backed by SQLite.
+
+    Values must be JSON-serializable. Entries expire after the TTL passed to `set`.
+    Calls are blocking; async callers should run them in a worker thread. The cache is
+    best effort: an unwritable, locked or corrupt database reads as a miss and skips writes.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self._conn: sqlite3.Connection | None = None
+        # One connection is shared across worker threads, so serialize access to it
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, key: str):
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                value, expires_at = row
+                if expires_at <= time.time():
+                    with conn:
+                        conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    return None
+            return json.loads(value)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.debug("Search cache read failed for %s: %s", self.path, e)
+            return None
+
+    def set(self, key: str, value, expire: float) -> None:
+        payload = json.dumps(value)
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, payload, time.time() + expire),
+                    )
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("Search cache write failed for %s: %s", self.path, e)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
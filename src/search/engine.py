@@ -1,108 +1,307 @@
 import asyncio
+import importlib.util
+import json
+import logging
+import operator
+import time
 import aiohttp
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
 
 from .base import BaseSearcher, SearchResult
+from .cache import DEFAULT_CACHE_PATH, DiskCache
+from .ratelimit import HostRateLimiter
 from .bing import BingNewsSearcher
 from .google import GoogleNewsSearcher
 from .wikipedia import WikipediaSearcher
 
+logger = logging.getLogger(__name__)
+
+# Process-wide HTTP session shared by every SearchEngine, so pooled connections,
+# cached DNS lookups and TLS sessions survive across queries
+_SESSION: aiohttp.ClientSession | None = None
+_SESSION_LOOP: asyncio.AbstractEventLoop | None = None
+
+def _get_headers() -> dict[str, str]:
+    return {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        # aiohttp can only decode brotli responses when the brotli package is installed
+        'Accept-Encoding': 'gzip, deflate, br' if importlib.util.find_spec('brotli') else 'gzip, deflate',
+        'Connection': 'keep-alive',
+    }
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared ClientSession, creating it on first use in the running event loop.
+    Await close_session() before that loop shuts down; a session left open is only
+    released when a later loop asks for a new one.
+    """
+    global _SESSION, _SESSION_LOOP
+    loop = asyncio.get_running_loop()
+    if _SESSION is not None and not _SESSION.closed and _SESSION_LOOP is not loop:
+        # A session is bound to the loop that created it; release the stale one
+        await close_session()
+    if _SESSION is None or _SESSION.closed:
+        # Keep idle connections for a minute (aiohttp's default is 15s) so queries typed a
+        # little apart still reuse the pooled TLS connections
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=10, ttl_dns_cache=300, keepalive_timeout=60)
+        _SESSION = aiohttp.ClientSession(
+            headers=_get_headers(),
+            timeout=aiohttp.ClientTimeout(total=30, connect=10),
+            connector=connector,
+        )
+        _SESSION_LOOP = loop
+    return _SESSION
+
+async def close_session() -> None:
+    """Close the shared ClientSession, if one is open."""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
 class SearchEngine:
-    def __init__(self):
-        # Initialize searcher classes, but don't create session yet
+    def __init__(self, cache_path: str | Path = DEFAULT_CACHE_PATH):
+        # Initialize searcher classes, but don't attach the session yet
         self._session = None
-        self._timeout = aiohttp.ClientTimeout(total=30, connect=10)
-        self._connector = aiohttp.TCPConnector(limit=50, limit_per_host=10)
-        self._headers = self._get_headers()
+        # Bounded LRU of search results keyed by (query, searchers). Each entry holds the
+        # results of one fetch, so calls asking for fewer results per source reuse it.
+        self._cache: OrderedDict[tuple, tuple[dict, float]] = OrderedDict()
+        self._cache_max = 256
+        self._cache_ttl = 900
+        # Entries answered before the slowest searchers finished are only kept briefly,
+        # until the background fan-out replaces them with the full entry
+        self._partial_ttl = 30
+        # Persistent second tier so repeat queries survive restarts
+        self._disk = DiskCache(cache_path)
+        # Searches currently running, so identical concurrent queries share one fan-out. Each
+        # runs in its own task and is only cancelled once no caller is waiting on it any more.
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._inflight_waiters: dict[tuple, int] = {}
+        # Searches still finishing after their callers were answered
+        self._background: set[asyncio.Task] = set()
+        # Caps concurrent outbound requests and paces them per host; requests only wait
+        # once a host's burst budget is spent
+        self._limiter = HostRateLimiter(max_concurrent=10, rate=5, period=1.0)
+
+    async def get_search_results(
+        self, query: str, max_results_per_source: int = 5, progress: asyncio.Event | None = None
+    ) -> dict:
+        """
+        Main search function with rate limiting and orchestration across searchers.
+        If `progress` is given, it is set once the search finishes, successfully or not.
+        """
+        try:
+            return await self._get_search_results(query, max_results_per_source)
+        finally:
+            if progress is not None:
+                progress.set()
 
-    async def get_search_results(self, query: str, max_results_per_source: int = 5) -> dict:
-        """Main search function with rate limiting and orchestration across searchers."""
+    async def _get_search_results(self, query: str, max_results_per_source: int) -> dict:
         if not self._session or self._session.closed:
             raise RuntimeError("SearchEngine must be used as an async context manager")
 
-        # Kick off all searchers in parallel and flatten results
-        tasks = [self._run_searcher(searcher, query, max_results_per_source) for searcher in self.searchers]
-        search_results: list[SearchResult] = [
-            result for results in await asyncio.gather(*tasks, return_exceptions=True) 
-            for result in results
+        key = (query, tuple(s.searcher for s in self.searchers))
+        entry = self._cache_get(key)
+        if entry is None:
+            # SQLite I/O runs in a worker thread so it never stalls the event loop
+            entry = await asyncio.to_thread(self._disk.get, json.dumps(key))
+            if entry is not None:
+                self._cache_put(key, entry)
+        if entry is not None and entry["max_results_per_source"] >= max_results_per_source:
+            return self._build_response(query, entry, max_results_per_source)
+
+        inflight_key = (key, max_results_per_source)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.create_task(self._search_and_store(key, query, max_results_per_source))
+            self._inflight[inflight_key] = task
+            self._inflight_waiters[inflight_key] = 0
+        self._inflight_waiters[inflight_key] += 1
+        try:
+            # Shield so a cancelled caller doesn't cancel the search other callers share
+            entry = await asyncio.shield(task)
+        finally:
+            self._inflight_waiters[inflight_key] -= 1
+            if not self._inflight_waiters[inflight_key]:
+                del self._inflight_waiters[inflight_key]
+                del self._inflight[inflight_key]
+                # The last caller is gone; stop the search if it's still running
+                task.cancel()
+
+        # Don't close session here - let context manager handle it
+        return self._build_response(query, entry, max_results_per_source)
+
+    async def _search_and_store(self, key: tuple, query: str, max_results_per_source: int) -> dict:
+        entry, complete = await self._search(key, query, max_results_per_source)
+        # Results missing a source aren't cached, so the next call retries it
+        if complete:
+            await self._store(key, entry)
+        return entry
+
+    async def _search(self, key: tuple, query: str, max_results_per_source: int) -> tuple[dict, bool]:
+        """
+        Fan out to every searcher and return the formatted, date-sorted results as a cache entry,
+        along with whether every searcher contributed to it.
+        """
+        # Kick off all searchers in parallel and collect results as each one finishes.
+        # Once there's enough headroom for the sort, answer without waiting on slower searchers.
+        # _run_searcher handles searcher errors, so awaiting the tasks only sees cancellations.
+        target = max_results_per_source * 2
+        # (rank within its searcher, result) pairs
+        search_results: list[tuple[int, SearchResult]] = []
+        complete = True
+        tasks = [
+            asyncio.create_task(self._run_searcher(searcher, query, max_results_per_source))
+            for searcher in self.searchers
         ]
-        
-        # Sort results by published date (normalize timezone-aware dates to naive for comparison)
-        search_results.sort(key=lambda x: self._datetime_sort_key(x.published_date), reverse=True)
+        try:
+            for finished, next_done in enumerate(asyncio.as_completed(tasks), 1):
+                results = await next_done
+                if results is None:
+                    complete = False
+                    continue
+                search_results.extend(enumerate(results))
+                if len(search_results) >= target and finished < len(tasks):
+                    entry = self._make_entry(search_results, max_results_per_source)
+                    if complete:
+                        # Serve repeats briefly from the partial entry while the slower
+                        # searchers finish in the background and cache the full one
+                        self._cache_put(key, entry, self._partial_ttl)
+                        self._spawn(self._finish_search(key, tasks, max_results_per_source))
+                    else:
+                        for task in tasks:
+                            task.cancel()
+                    return entry, False
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        return self._make_entry(search_results, max_results_per_source), complete
 
-        # Format results for response
-        response = {
-            "query": query,
+    async def _finish_search(self, key: tuple, tasks: list[asyncio.Task], max_results_per_source: int) -> None:
+        """Wait for every searcher of an already-answered search and cache the full entry."""
+        all_results = await asyncio.gather(*tasks)
+        if any(results is None for results in all_results):
+            return
+        search_results = [pair for results in all_results for pair in enumerate(results)]
+        await self._store(key, self._make_entry(search_results, max_results_per_source))
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        # Hold a reference so the task isn't garbage collected before it finishes
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _store(self, key: tuple, entry: dict) -> None:
+        """Cache a complete entry in both tiers, unless a larger one is already cached."""
+        current = self._cache_get(key)
+        if current is not None and current["max_results_per_source"] > entry["max_results_per_source"]:
+            return
+        self._cache_put(key, entry)
+        await asyncio.to_thread(self._disk.set, json.dumps(key), entry, self._cache_ttl)
+
+    def _make_entry(self, search_results: list[tuple[int, SearchResult]], max_results_per_source: int) -> dict:
+        """Format (rank, result) pairs into a date-sorted cache entry."""
+        # Sort results by published date (normalize timezone-aware dates to naive for comparison).
+        # Keys are computed once up front so the sort only compares datetimes.
+        decorated = [(self._datetime_sort_key(r.published_date), rank, r) for rank, r in search_results]
+        decorated.sort(key=operator.itemgetter(0), reverse=True)
+
+        # Format each result once; responses are built from these by rank
+        return {
+            "max_results_per_source": max_results_per_source,
             "results": [
-                {
-                    "title": r.title,
-                    "url": r.url,
-                    "published_date": r.published_date.isoformat() if r.published_date else None,
-                    "searcher": r.searcher,
-                }
-                for r in search_results
+                [
+                    rank,
+                    {
+                        "title": r.title,
+                        "url": r.url,
+                        "published_date": r.published_date.isoformat() if r.published_date else None,
+                        "searcher": r.searcher,
+                    },
+                ]
+                for _, rank, r in decorated
             ],
         }
 
-        # Don't close session here - let context manager handle it
-        return response
+    def _build_response(self, query: str, entry: dict, max_results_per_source: int) -> dict:
+        """Format a response from a cache entry, keeping each searcher's top results."""
+        return {
+            "query": query,
+            "results": [result for rank, result in entry["results"] if rank < max_results_per_source],
+        }
+
+    def _cache_get(self, key: tuple) -> dict | None:
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        entry, expires_at = cached
+        if time.monotonic() >= expires_at:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry
 
-    async def _run_searcher(self, searcher: BaseSearcher, query: str, max_results: int) -> list[SearchResult]:
-        # small delay to avoid rate limiting bursts
-        await asyncio.sleep(0.5)
+    def _cache_put(self, key: tuple, entry: dict, ttl: float | None = None) -> None:
+        self._cache[key] = (entry, time.monotonic() + (self._cache_ttl if ttl is None else ttl))
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
+    async def _run_searcher(self, searcher: BaseSearcher, query: str, max_results: int) -> list[SearchResult] | None:
+        """Run one searcher, returning None if it failed."""
         try:
             return await searcher.get_search_results(query, max_results)
         except asyncio.TimeoutError:
-            print(f"Timeout when searching with {searcher.__class__.__name__}")
-            return []
+            logger.warning("Timeout when searching with %s", searcher.__class__.__name__)
+            return None
         except Exception as e:
-            print(f"Exception when searching with {searcher.__class__.__name__}: {str(e)}")
-            return []
-        
-    
-    def _get_headers(self) -> dict[str, str]:
-        return {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
-            
+            logger.warning("Exception when searching with %s: %s", searcher.__class__.__name__, e)
+            return None
+
     async def __aenter__(self):
-        # Create session when entering context
-        self._session = aiohttp.ClientSession(
-            headers=self._headers, 
-            timeout=self._timeout, 
-            connector=self._connector
-        )
-        # Initialize searchers with session
+        # Attach the shared session when entering context
+        self._session = await get_session()
+        # Initialize searchers with session and the shared request limiter
         self.searchers = [
-            BingNewsSearcher(self._session), 
-            GoogleNewsSearcher(self._session), 
-            WikipediaSearcher(self._session),
+            BingNewsSearcher(self._session, self._limiter),
+            GoogleNewsSearcher(self._session, self._limiter),
+            WikipediaSearcher(self._session, self._limiter),
         ]
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        # Ensure session is properly closed when exiting context
-        if self._session and not self._session.closed:
-            await self._session.close()
+        # The shared session outlives this engine; only release per-engine resources
+        self._session = None
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        self._disk.close()
 
+    @staticmethod
     def _datetime_sort_key(dt: datetime | None) -> datetime:
-      """
-      Normalize datetime objects for sorting by converting timezone-aware dates to naive.
-      Returns datetime.min for None values to sort them last when reverse=True.
-      """
-      if dt is None:
-          return datetime.min
-      # Convert timezone-aware to naive by replacing tzinfo
-      return dt.replace(tzinfo=None) if dt.tzinfo is not None else dt 
+        """
+        Normalize datetime objects for sorting by converting timezone-aware dates to naive UTC.
+        Returns datetime.min for None values to sort them last when reverse=True.
+        """
+        if dt is None:
+            return datetime.min
+        if dt.tzinfo is not None:
+            return dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt
+
 
 async def main():
-    async with SearchEngine() as search_engine:
-        results = await search_engine.get_search_results("Apple earnings")
-        print(results)
+    try:
+        async with SearchEngine() as search_engine:
+            results = await search_engine.get_search_results("Apple earnings")
+            print(results)
+    finally:
+        await close_session()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,45 +1,124 @@
 import asyncio
+import base64
+import binascii
+import logging
+import re
 import aiohttp
+from collections import OrderedDict
+from urllib.parse import urlsplit
 from .base import BaseSearcher, SearchResult
+from .ratelimit import HostRateLimiter
+
+# Optional: googlenewsdecoder to unwrap news.google.com redirect links
+try:
+    from googlenewsdecoder import gnewsdecoder
+except ImportError:  # googlenewsdecoder not installed
+    gnewsdecoder = None
+
+logger = logging.getLogger(__name__)
+
+_ARTICLE_ID_RE = re.compile(r'/articles/([A-Za-z0-9_-]+)')
+_EMBEDDED_URL_RE = re.compile(rb'https?://[\x21-\x7e]+')
+
+def _fast_decode_google_news_url(url: str) -> str | None:
+    """
+    Extract the article URL embedded in an older-style Google News article id.
+
+    Those ids are base64 protobuf blobs carrying the target URL in plain bytes. Newer
+    ids are opaque and return None, as does anything that doesn't decode.
+    """
+    match = _ARTICLE_ID_RE.search(url)
+    if match is None:
+        return None
+    payload = match.group(1)
+    try:
+        decoded = base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    # The canonical article URL comes first; later fields may hold its AMP variant
+    for raw in _EMBEDDED_URL_RE.findall(decoded):
+        candidate = raw.decode('ascii')
+        host = urlsplit(candidate).hostname or ''
+        if host and host != 'google.com' and not host.endswith('.google.com'):
+            return candidate
+    return None
 
 class GoogleNewsSearcher(BaseSearcher):
     
-    def __init__(self, session: aiohttp.ClientSession):
+    def __init__(self, session: aiohttp.ClientSession, limiter: HostRateLimiter | None = None):
         self.session = session
+        self.limiter = limiter
+        # Bounded LRU of Google News URL -> future of the decoded article URL. Storing
+        # futures lets concurrent lookups of the same URL share a single decode.
+        self._url_cache: OrderedDict[str, asyncio.Future] = OrderedDict()
+        self._url_cache_max = 4096
 
     @property
     def searcher(self) -> str:
         return "Google News"
+
+    @property
+    def host(self) -> str:
+        return "news.google.com"
     
     async def get_search_results(self, query: str, max_results: int) -> list[SearchResult]:
         search_url = f"https://news.google.com/rss/search?q={query.replace(' ', '%20')}&hl=en-US&gl=US&ceid=US:en"
 
-        async with self.session.get(search_url) as response:
-            if response.status != 200:
-                return []
-            xml_content = await response.text()
-            results = self.parse_rss_content(xml_content, max_results)
-            resolved_urls = await asyncio.gather(*(self._resolve_google_news_url(r.url) for r in results))
-            final: list[SearchResult] = []
-            for r, resolved in zip(results, resolved_urls):
-                final.append(
-                    SearchResult(
-                        title=r.title, 
-                        url=resolved, 
-                        published_date=r.published_date,
-                        searcher=self.searcher,
-                        )
-                    )
-            return final
+        async with self._limit(self.host):
+            async with self.session.get(search_url) as response:
+                if response.status != 200:
+                    return []
+                # Parse items as the body streams in, and stop reading once we have enough
+                results = await self.parse_rss_response(response, max_results)
+
+        # Resolve outside the fetch's limiter slot; each resolution takes its own
+        resolved_urls = await asyncio.gather(*(self._resolve_google_news_url(r.url) for r in results))
+        # The parsed results are ours, so swap the URL in place rather than rebuilding them
+        for r, resolved in zip(results, resolved_urls):
+            r.url = resolved
+        return results
 
     async def _resolve_google_news_url(self, url: str) -> str:
         if not url or 'news.google.com' not in url:
             return url
+
+        # Older article ids embed the target URL, so no network decode is needed
+        fast = _fast_decode_google_news_url(url)
+        if fast is not None:
+            return fast
+
+        cached = self._url_cache.get(url)
+        if cached is not None:
+            self._url_cache.move_to_end(url)
+            # Shield so a cancelled waiter doesn't cancel the shared lookup
+            return await asyncio.shield(cached)
+
+        future = asyncio.get_running_loop().create_future()
+        self._url_cache[url] = future
+        while len(self._url_cache) > self._url_cache_max:
+            self._url_cache.popitem(last=False)
+
+        resolved = None
         try:
-            from googlenewsdecoder import gnewsdecoder
-            result = await asyncio.to_thread(gnewsdecoder, url, interval=1)
+            resolved = await self._decode_google_news_url(url)
+        finally:
+            if resolved is None and self._url_cache.get(url) is future:
+                # Don't remember failures so the next lookup retries
+                del self._url_cache[url]
+            future.set_result(resolved or url)
+        return resolved or url
+
+    async def _decode_google_news_url(self, url: str) -> str | None:
+        if gnewsdecoder is None:
+            return None
+        try:
+            # The decoder makes its own request to news.google.com, so it shares that host's budget
+            async with self._limit(self.host):
+                result = await asyncio.to_thread(gnewsdecoder, url, interval=1)
             if result.get("status"):
                 return result["decoded_url"]
-            return url
+            logger.debug("Could not decode Google News URL %s: %s", url, result.get("message"))
+            return None
         except Exception:
-            return url
\ No newline at end of file
+            logger.debug("Error decoding Google News URL %s", url, exc_info=True)
+            return None
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Allows `rate` acquisitions per `period` seconds, with bursts of up to `rate`.
+    Callers only wait when the bucket is empty.
+    """
+
+    def __init__(self, rate: float, period: float = 1.0):
+        self.capacity = rate
+        self.tokens = rate
+        self.refill_rate = rate / period
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+class HostRateLimiter:
+    """
+    Caps the number of concurrent outbound requests and paces them per host.
+
+    Each host gets its own TokenBucket of `rate` requests per `period` seconds.
+    """
+
+    def __init__(self, max_concurrent: int = 10, rate: float = 5, period: float = 1.0):
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self._rate = rate
+        self._period = period
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def _bucket_for(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self._rate, self._period)
+        return bucket
+
+    @asynccontextmanager
+    async def limit(self, host: str):
+        # Wait for the host's token before taking a slot, so requests paced on one
+        # host don't sit on slots that requests to other hosts could use
+        await self._bucket_for(host).acquire()
+        async with self._sem:
+            yield
@@ -1,5 +1,6 @@
 import aiohttp
 from .base import BaseSearcher, SearchResult
+from .ratelimit import HostRateLimiter
 from datetime import datetime
 
 class WikipediaSearcher(BaseSearcher):
@@ -7,13 +8,18 @@ class WikipediaSearcher(BaseSearcher):
     Searcher for Wikipedia using the MediaWiki search API.
     """
 
-    def __init__(self, session: aiohttp.ClientSession):
+    def __init__(self, session: aiohttp.ClientSession, limiter: HostRateLimiter | None = None):
         self.session = session
+        self.limiter = limiter
 
     @property
     def searcher(self) -> str:
         return "Wikipedia"
 
+    @property
+    def host(self) -> str:
+        return "en.wikipedia.org"
+
     async def get_search_results(self, query: str, max_results: int) -> list[SearchResult]:
         encoded_query = query.replace(" ", "%20")
         search_url = (
@@ -21,32 +27,34 @@ class WikipediaSearcher(BaseSearcher):
             f"?action=query&list=search&srsearch={encoded_query}&utf8=&format=json&srlimit={max_results}"
         )
 
-        async with self.session.get(search_url) as response:
-            if response.status != 200:
-                return []
-
-            data = await response.json()
-            results: list[SearchResult] = []
-
-            for item in data.get("query", {}).get("search", []):
-                title = item.get("title", "No title")
-                page_id = item.get("pageid")
-                url = f"https://en.wikipedia.org/?curid={page_id}"
-                ts = item.get("timestamp")  # ISO8601 format
-                published_date = None
-                if ts:
-                    try:
-                        published_date = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                    except Exception:
-                        published_date = None
-
-                results.append(
-                    SearchResult(
-                        title=self.clean_text(title),
-                        url=url,
-                        published_date=published_date,
-                        searcher=self.searcher,
-                    )
+        async with self._limit(self.host):
+            async with self.session.get(search_url) as response:
+                if response.status != 200:
+                    return []
+
+                data = await response.json()
+
+        results: list[SearchResult] = []
+
+        for item in data.get("query", {}).get("search", []):
+            title = item.get("title", "No title")
+            page_id = item.get("pageid")
+            url = f"https://en.wikipedia.org/?curid={page_id}"
+            ts = item.get("timestamp")  # ISO8601 format
+            published_date = None
+            if ts:
+                try:
+                    published_date = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+                except Exception:
+                    published_date = None
+
+            results.append(
+                SearchResult(
+                    title=self.clean_text(title),
+                    url=url,
+                    published_date=published_date,
+                    searcher=self.searcher,
                 )
+            )
 
-            return results
+        return results
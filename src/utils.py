@@ -1,13 +1,17 @@
 import asyncio
 
-async def spinner(message: str = "Searching...", interval: float = 0.1):
+async def spinner(message: str = "Searching...", done: asyncio.Event | None = None, interval: float = 0.1):
+    """Animate `message` until `done` is set; the timeout only advances the frame."""
+    done = done or asyncio.Event()
     symbols = "|/-\\"
     idx = 0
     try:
-        while True:
+        while not done.is_set():
             print(f"{message} {symbols[idx % len(symbols)]}", end="\r", flush=True)
             idx += 1
-            await asyncio.sleep(interval)
-    except asyncio.CancelledError:
+            try:
+                await asyncio.wait_for(done.wait(), timeout=interval)
+            except TimeoutError:
+                pass
+    finally:
         print(" " * (len(message) + 2), end="\r", flush=True)
-        raise 
\ No newline at end of file
@@ -0,0 +1,96 @@
+import sys
+import time
+import asyncio
+import pathlib
+
+import pytest
+
+# Ensure src is on sys.path for direct imports when running from repo root
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+import parse.base
+from parse.base import BasePageParser
+
+HTML = "<html><head><title>Short page</title></head><body><article>Just a few words.</article></body></html>"
+
+@pytest.mark.asyncio
+async def test_entering_parser_does_not_launch_browser():
+    async with BasePageParser() as parser:
+        assert parser._browser is None
+        assert parser._pw is None
+
+@pytest.mark.asyncio
+async def test_get_content_without_playwright_returns_fast_result(monkeypatch):
+    monkeypatch.setattr(parse.base, "async_playwright", None)
+
+    async with BasePageParser() as parser:
+        async def fast_fetch(url):
+            return HTML
+        monkeypatch.setattr(parser, "_fast_fetch", fast_fetch)
+
+        result = await parser.get_content("https://example.com/short")
+
+    assert result["title"] == "Short page"
+    assert result["content"] == "Just a few words."
+    assert result["content_length"] == len("Just a few words.")
+
+@pytest.mark.asyncio
+async def test_vendored_readability_matches_pinned_hash():
+    parser = BasePageParser()
+
+    script = await parser._get_readability_script()
+
+    assert script is not None
+    assert "function Readability(" in script
+
+def test_modified_readability_is_not_loaded(tmp_path, monkeypatch):
+    tampered = tmp_path / "Readability.js"
+    tampered.write_bytes(parse.base.READABILITY_PATH.read_bytes() + b"\nalert(1);\n")
+    monkeypatch.setattr(parse.base, "READABILITY_PATH", tampered)
+
+    assert parse.base._load_readability_script() is None
+
+def test_missing_readability_is_not_loaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(parse.base, "READABILITY_PATH", tmp_path / "missing.js")
+
+    assert parse.base._load_readability_script() is None
+
+class FakePage:
+    def __init__(self, idle_after: float, selector_after: float):
+        self.idle_after = idle_after
+        self.selector_after = selector_after
+
+    async def wait_for_load_state(self, state, timeout):
+        await asyncio.sleep(min(self.idle_after, timeout / 1000))
+        if self.idle_after > timeout / 1000:
+            raise TimeoutError(state)
+
+    async def wait_for_selector(self, selector, timeout):
+        await asyncio.sleep(min(self.selector_after, timeout / 1000))
+        if self.selector_after > timeout / 1000:
+            raise TimeoutError(selector)
+
+@pytest.mark.asyncio
+async def test_wait_until_settled_returns_once_article_renders():
+    parser = BasePageParser()
+    # The network never goes idle, but the article shows up quickly
+    page = FakePage(idle_after=60, selector_after=0.01)
+
+    start = time.monotonic()
+    await parser._wait_until_settled(page)
+
+    assert time.monotonic() - start < 0.5
+
+@pytest.mark.asyncio
+async def test_wait_until_settled_is_capped(monkeypatch):
+    monkeypatch.setattr(BasePageParser, "SETTLE_TIMEOUT_MS", 50)
+    parser = BasePageParser()
+    page = FakePage(idle_after=60, selector_after=60)
+
+    start = time.monotonic()
+    await parser._wait_until_settled(page)
+
+    assert time.monotonic() - start < 0.5
@@ -1,6 +1,8 @@
 import sys
 import pathlib
 
+import pytest
+
 # Ensure src is on sys.path for direct imports when running from repo root
 REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
 SRC_DIR = REPO_ROOT / "src"
@@ -11,10 +13,10 @@ from parse.base import BasePageParser
 
 URL = "https://www.cnbc.com/2025/07/31/apple-aapl-q3-earnings-report-2025.html"
 
-def test_pageparser_get_links_with_playwright_real_site(tmp_path):
-    parser = BasePageParser()
-
-    result = parser.get_links(URL)
+@pytest.mark.asyncio
+async def test_pageparser_get_links_with_playwright_real_site(tmp_path):
+    async with BasePageParser() as parser:
+        result = await parser.get_links(URL)
 
     assert isinstance(result, dict)
     assert result.get("url") == URL
@@ -23,10 +25,10 @@ def test_pageparser_get_links_with_playwright_real_site(tmp_path):
     # Should find at least some links on a long article page
     assert len(links) > 5
 
-def test_pageparser_get_content_with_playwright_real_site(tmp_path):
-    parser = BasePageParser()
-
-    result = parser.get_content(URL)
+@pytest.mark.asyncio
+async def test_pageparser_get_content_with_playwright_real_site(tmp_path):
+    async with BasePageParser() as parser:
+        result = await parser.get_content(URL)
 
     assert isinstance(result, dict)
     assert result.get("url") == URL
@@ -0,0 +1,139 @@
+import sys
+import pathlib
+import pytest
+from datetime import datetime, timezone
+
+# Ensure src is on sys.path for direct imports when running from repo root
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from search.bing import BingNewsSearcher
+
+class FakeContent:
+    def __init__(self, body: bytes, chunk_size: int):
+        self.chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+        self.read = 0
+
+    async def iter_chunked(self, n):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+class FakeResponse:
+    def __init__(self, body: bytes, chunk_size: int = 16):
+        self.content = FakeContent(body, chunk_size)
+
+RSS = """<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Feed</title>
+    <item>
+      <title>Apple &amp; earnings</title>
+      <link>https://example.com/a</link>
+      <pubDate>Thu, 31 Jul 2025 20:30:00 GMT</pubDate>
+    </item>
+    <item>
+      <title>Second</title>
+      <link>https://example.com/b</link>
+    </item>
+    <item>
+      <title>Third</title>
+      <link>https://example.com/c</link>
+    </item>
+  </channel>
+</rss>
+"""
+
+def test_parse_rss_bytes_extracts_items():
+    searcher = BingNewsSearcher(session=None)
+
+    results = searcher.parse_rss_bytes(RSS.encode("utf-8"), max_results=2)
+
+    assert [r.url for r in results] == ["https://example.com/a", "https://example.com/b"]
+    assert results[0].title == "Apple & earnings"
+    assert results[0].published_date == datetime(2025, 7, 31, 20, 30, tzinfo=timezone.utc)
+    assert results[1].published_date is None
+    assert all(r.searcher == "Bing News" for r in results)
+
+def test_parse_rss_content_accepts_str_and_bytes():
+    searcher = BingNewsSearcher(session=None)
+
+    from_str = searcher.parse_rss_content(RSS, max_results=3)
+    from_bytes = searcher.parse_rss_content(RSS.encode("utf-8"), max_results=3)
+
+    assert [r.url for r in from_str] == [r.url for r in from_bytes]
+    assert len(from_bytes) == 3
+
+def test_parse_rss_bytes_returns_empty_on_invalid_xml():
+    searcher = BingNewsSearcher(session=None)
+
+    assert searcher.parse_rss_bytes(b"<rss><channel>", max_results=5) == []
+
+def test_parse_rss_bytes_stops_before_trailing_items():
+    searcher = BingNewsSearcher(session=None)
+    # Everything after the first item is truncated; it must never be parsed
+    truncated = RSS.encode("utf-8")[: RSS.index("<title>Second")]
+
+    results = searcher.parse_rss_bytes(truncated, max_results=1)
+
+    assert [r.url for r in results] == ["https://example.com/a"]
+
+def test_clean_text_strips_tags_and_normalizes_unicode():
+    searcher = BingNewsSearcher(session=None)
+
+    text = "<b>Apple’s</b> “Q3” &amp; more… Apple® Watch™ — café  \n news"
+
+    assert searcher.clean_text(text) == "Apple's \"Q3\" & more... Apple(R) Watch(TM) - caf news"
+
+def test_parse_date_matches_supported_formats():
+    searcher = BingNewsSearcher(session=None)
+
+    assert searcher.parse_date("Published 2025-07-31 by staff") == datetime(2025, 7, 31)
+    assert searcher.parse_date("7/31/2025") == datetime(2025, 7, 31)
+    assert searcher.parse_date("July 31, 2025") == datetime(2025, 7, 31)
+    assert searcher.parse_date("yesterday") is None
+    # A match that isn't a real date falls through to the next pattern
+    assert searcher.parse_date("2025-13-45 or July 31, 2025") == datetime(2025, 7, 31)
+
+def test_parse_rss_date_keeps_timezone_offset():
+    searcher = BingNewsSearcher(session=None)
+
+    parsed = searcher.parse_rss_date("Thu, 31 Jul 2025 16:30:00 -0400")
+
+    assert parsed == datetime(2025, 7, 31, 20, 30, tzinfo=timezone.utc)
+    assert searcher.parse_rss_date("2025-07-31") == datetime(2025, 7, 31)
+
+@pytest.mark.asyncio
+async def test_parse_rss_response_matches_bytes_parser():
+    searcher = BingNewsSearcher(session=None)
+    response = FakeResponse(RSS.encode("utf-8"))
+
+    results = await searcher.parse_rss_response(response, max_results=5)
+
+    assert [r.url for r in results] == [r.url for r in searcher.parse_rss_bytes(RSS.encode("utf-8"), 5)]
+    assert len(results) == 3
+    assert response.content.read == len(response.content.chunks)
+
+@pytest.mark.asyncio
+async def test_parse_rss_response_stops_parsing_but_drains_body():
+    searcher = BingNewsSearcher(session=None)
+    # Anything parsed after the first item would raise on the malformed tail
+    body = RSS.encode("utf-8")[: RSS.index("<item>", RSS.index("</item>"))] + b"<item><oops></item>"
+    response = FakeResponse(body)
+
+    results = await searcher.parse_rss_response(response, max_results=1)
+
+    assert [r.url for r in results] == ["https://example.com/a"]
+    # The whole body is consumed so the connection can be reused
+    assert response.content.read == len(response.content.chunks)
+
+@pytest.mark.asyncio
+async def test_parse_rss_response_keeps_items_before_invalid_xml():
+    searcher = BingNewsSearcher(session=None)
+    body = RSS.encode("utf-8").replace(b"<title>Third</title>", b"<title>Third</oops>")
+
+    results = await searcher.parse_rss_response(FakeResponse(body), max_results=5)
+
+    assert [r.url for r in results] == ["https://example.com/a", "https://example.com/b"]
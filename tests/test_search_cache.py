@@ -0,0 +1,46 @@
+import sys
+import pathlib
+
+# Ensure src is on sys.path for direct imports when running from repo root
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from search.cache import DiskCache
+
+def test_disk_cache_round_trip_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = DiskCache(path)
+    cache.set("key", {"query": "apple", "results": []}, expire=60)
+    cache.close()
+
+    reopened = DiskCache(path)
+    assert reopened.get("key") == {"query": "apple", "results": []}
+    assert reopened.get("missing") is None
+    reopened.close()
+
+def test_disk_cache_expired_entries_are_dropped(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite3")
+    cache.set("key", {"query": "apple"}, expire=-1)
+
+    assert cache.get("key") is None
+    cache.close()
+
+def test_disk_cache_unusable_path_is_a_miss(tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    cache = DiskCache(blocker / "cache.sqlite3")
+
+    cache.set("key", {"query": "apple"}, expire=60)
+    assert cache.get("key") is None
+    cache.close()
+
+def test_disk_cache_corrupt_file_is_a_miss(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    path.write_bytes(b"this is not a sqlite database" * 100)
+    cache = DiskCache(path)
+
+    cache.set("key", {"query": "apple"}, expire=60)
+    assert cache.get("key") is None
+    cache.close()
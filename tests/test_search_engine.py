@@ -0,0 +1,238 @@
+import sys
+import asyncio
+import pathlib
+import pytest
+
+# Ensure src is on sys.path for direct imports when running from repo root
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from search.base import SearchResult
+from search.engine import SearchEngine, close_session, get_session
+
+class FakeSearcher:
+    def __init__(self, name: str, delay: float = 0.01):
+        self.searcher = name
+        self.delay = delay
+        self.calls = 0
+
+    async def get_search_results(self, query: str, max_results: int) -> list[SearchResult]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [
+            SearchResult(title=f"{self.searcher} {i}", url=f"https://example.com/{self.searcher}/{i}", searcher=self.searcher)
+            for i in range(max_results)
+        ]
+
+class FlakySearcher(FakeSearcher):
+    def __init__(self, name: str, failures: int):
+        super().__init__(name)
+        self.failures = failures
+
+    async def get_search_results(self, query: str, max_results: int) -> list[SearchResult]:
+        if self.failures:
+            self.failures -= 1
+            self.calls += 1
+            raise ConnectionError("network blip")
+        return await super().get_search_results(query, max_results)
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_break_shared_search(tmp_path):
+    try:
+        async with SearchEngine(cache_path=tmp_path / "cache.sqlite3") as engine:
+            engine.searchers = [FakeSearcher("A", delay=0.05)]
+
+            leader = asyncio.create_task(engine.get_search_results("apple", 2))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(engine.get_search_results("apple", 2))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+
+            response = await leader
+            assert [r["title"] for r in response["results"]] == ["A 0", "A 1"]
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+            # The leader's result was cached, so this doesn't fan out again
+            await engine.get_search_results("apple", 2)
+            assert engine.searchers[0].calls == 1
+    finally:
+        await close_session()
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_waiters(tmp_path):
+    try:
+        async with SearchEngine(cache_path=tmp_path / "cache.sqlite3") as engine:
+            engine.searchers = [FakeSearcher("A", delay=0.05)]
+
+            leader = asyncio.create_task(engine.get_search_results("apple", 2))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(engine.get_search_results("apple", 2))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+
+            response = await waiter
+            assert [r["title"] for r in response["results"]] == ["A 0", "A 1"]
+            assert leader.cancelled()
+            assert engine.searchers[0].calls == 1
+    finally:
+        await close_session()
+
+@pytest.mark.asyncio
+async def test_search_is_cancelled_when_every_caller_is(tmp_path):
+    try:
+        async with SearchEngine(cache_path=tmp_path / "cache.sqlite3") as engine:
+            engine.searchers = [FakeSearcher("A", delay=0.05)]
+
+            callers = [asyncio.create_task(engine.get_search_results("apple", 2)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            search = engine._inflight[(("apple", ("A",)), 2)]
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            await asyncio.sleep(0)
+
+            assert search.cancelled()
+            assert not engine._inflight
+    finally:
+        await close_session()
+
+@pytest.mark.asyncio
+async def test_failed_searcher_results_are_not_cached(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    try:
+        async with SearchEngine(cache_path=path) as engine:
+            engine.searchers = [FakeSearcher("A"), FlakySearcher("B", failures=1)]
+
+            degraded = await engine.get_search_results("apple", 1)
+            assert [r["searcher"] for r in degraded["results"]] == ["A"]
+
+            # B has recovered; the degraded response must not be served from cache
+            recovered = await engine.get_search_results("apple", 1)
+            assert sorted(r["searcher"] for r in recovered["results"]) == ["A", "B"]
+
+        async with SearchEngine(cache_path=path) as engine:
+            engine.searchers = [FakeSearcher("A"), FlakySearcher("B", failures=0)]
+
+            # The complete response was persisted, so a fresh engine doesn't fan out
+            from_disk = await engine.get_search_results("apple", 1)
+            assert sorted(r["searcher"] for r in from_disk["results"]) == ["A", "B"]
+            assert [s.calls for s in engine.searchers] == [0, 0]
+    finally:
+        await close_session()
+
+@pytest.mark.asyncio
+async def test_early_exit_serves_repeats_from_cache(tmp_path):
+    try:
+        async with SearchEngine(cache_path=tmp_path / "cache.sqlite3") as engine:
+            engine.searchers = [FakeSearcher("A"), FakeSearcher("B"), FakeSearcher("C", delay=0.2)]
+
+            partial = await engine.get_search_results("apple")
+            assert "C" not in {r["searcher"] for r in partial["results"]}
+
+            # The partial entry answers the repeat while C is still running
+            assert await engine.get_search_results("apple") == partial
+            assert [s.calls for s in engine.searchers] == [1, 1, 1]
+
+            # Once C finishes, the full entry replaces it without another fan-out
+            await asyncio.gather(*engine._background)
+            full = await engine.get_search_results("apple")
+            assert {r["searcher"] for r in full["results"]} == {"A", "B", "C"}
+            assert [s.calls for s in engine.searchers] == [1, 1, 1]
+    finally:
+        await close_session()
+
+@pytest.mark.asyncio
+async def test_early_exit_persists_only_the_full_entry(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    try:
+        async with SearchEngine(cache_path=path) as engine:
+            engine.searchers = [FakeSearcher("A"), FakeSearcher("B"), FakeSearcher("C", delay=0.2)]
+            await engine.get_search_results("apple")
+            await asyncio.gather(*engine._background)
+
+        async with SearchEngine(cache_path=path) as engine:
+            engine.searchers = [FakeSearcher("A"), FakeSearcher("B"), FakeSearcher("C")]
+            from_disk = await engine.get_search_results("apple")
+            assert {r["searcher"] for r in from_disk["results"]} == {"A", "B", "C"}
+            assert [s.calls for s in engine.searchers] == [0, 0, 0]
+    finally:
+        await close_session()
+
+@pytest.mark.asyncio
+async def test_unusable_disk_cache_does_not_fail_search(tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    try:
+        async with SearchEngine(cache_path=blocker / "cache.sqlite3") as engine:
+            engine.searchers = [FakeSearcher("A"), FakeSearcher("B")]
+
+            response = await engine.get_search_results("apple", 1)
+            assert sorted(r["searcher"] for r in response["results"]) == ["A", "B"]
+    finally:
+        await close_session()
+
+@pytest.mark.asyncio
+async def test_memory_cache_evicts_least_recently_used(tmp_path):
+    try:
+        async with SearchEngine(cache_path=tmp_path / "cache.sqlite3") as engine:
+            engine.searchers = [FakeSearcher("A")]
+            engine._cache_max = 2
+
+            await engine.get_search_results("first", 1)
+            await engine.get_search_results("second", 1)
+            # Touch "first" so "second" becomes the least recently used entry
+            await engine.get_search_results("first", 1)
+            await engine.get_search_results("third", 1)
+
+            assert [query for query, _ in engine._cache] == ["first", "third"]
+            assert engine.searchers[0].calls == 3
+    finally:
+        await close_session()
+
+@pytest.mark.asyncio
+async def test_cached_entries_expire_after_ttl(tmp_path):
+    try:
+        async with SearchEngine(cache_path=tmp_path / "cache.sqlite3") as engine:
+            engine.searchers = [FakeSearcher("A")]
+            engine._cache_ttl = 0.05
+
+            await engine.get_search_results("apple", 1)
+            await engine.get_search_results("apple", 1)
+            assert engine.searchers[0].calls == 1
+
+            await asyncio.sleep(0.1)
+            await engine.get_search_results("apple", 1)
+            assert engine.searchers[0].calls == 2
+    finally:
+        await close_session()
+
+@pytest.mark.asyncio
+async def test_smaller_requests_are_sliced_from_a_larger_cached_entry(tmp_path):
+    try:
+        async with SearchEngine(cache_path=tmp_path / "cache.sqlite3") as engine:
+            engine.searchers = [FakeSearcher("A"), FakeSearcher("B")]
+
+            full = await engine.get_search_results("apple", 5)
+            assert len(full["results"]) == 10
+
+            sliced = await engine.get_search_results("apple", 2)
+            assert sorted(r["title"] for r in sliced["results"]) == ["A 0", "A 1", "B 0", "B 1"]
+            assert [s.calls for s in engine.searchers] == [1, 1]
+
+            # Asking for more than the cached entry holds fans out again
+            await engine.get_search_results("apple", 6)
+            assert [s.calls for s in engine.searchers] == [2, 2]
+    finally:
+        await close_session()
+
+def test_session_from_a_previous_loop_is_closed():
+    first = asyncio.run(get_session())
+    second = asyncio.run(get_session())
+
+    assert first is not second
+    assert first.closed
+    asyncio.run(close_session())
+    assert second.closed
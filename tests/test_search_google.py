@@ -0,0 +1,85 @@
+import sys
+import asyncio
+import pathlib
+import base64
+
+import pytest
+
+# Ensure src is on sys.path for direct imports when running from repo root
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from search.google import GoogleNewsSearcher, _fast_decode_google_news_url
+
+def _article_url(payload: bytes) -> str:
+    article_id = base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+    return f"https://news.google.com/rss/articles/{article_id}?oc=5"
+
+def test_fast_decode_extracts_embedded_url():
+    target = b"https://www.example.com/markets/apple-earnings-q3.html"
+    # Protobuf-style framing around the URL, as in older Google News article ids
+    payload = b"\x08\x13\x22" + bytes([len(target)]) + target + b"\xd2\x01\x00"
+
+    assert _fast_decode_google_news_url(_article_url(payload)) == target.decode("ascii")
+
+def test_fast_decode_prefers_canonical_url_over_amp():
+    canonical = b"https://www.example.com/apple-earnings-q3-2023"
+    amp = b"https://www.example.com/apple-earnings-q3-2023.amp"
+    # Field 4 (0x22) holds the canonical URL, field 26 (0xd2 0x01) the AMP variant
+    payload = b"\x08\x13\x22" + bytes([len(canonical)]) + canonical + b"\xd2\x01" + bytes([len(amp)]) + amp
+
+    assert _fast_decode_google_news_url(_article_url(payload)) == canonical.decode("ascii")
+
+def test_fast_decode_ignores_google_hosts():
+    payload = b"\x08\x13\x22\x1chttps://news.google.com/about\xd2\x01\x00"
+
+    assert _fast_decode_google_news_url(_article_url(payload)) is None
+
+def test_fast_decode_returns_none_for_opaque_ids():
+    assert _fast_decode_google_news_url("https://news.google.com/rss/articles/AU_yqLOpaque?oc=5") is None
+    assert _fast_decode_google_news_url("https://news.google.com/rss/articles/%%%") is None
+    assert _fast_decode_google_news_url("https://news.google.com/topics/abc") is None
+
+
+OPAQUE_URL = "https://news.google.com/rss/articles/AU_yqLOpaque?oc=5"
+
+def _searcher_with_decoder(monkeypatch, decoded: str | None, delay: float = 0.01):
+    searcher = GoogleNewsSearcher(session=None)
+    calls = []
+
+    async def decode(url):
+        calls.append(url)
+        await asyncio.sleep(delay)
+        return decoded
+
+    monkeypatch.setattr(searcher, "_decode_google_news_url", decode)
+    return searcher, calls
+
+@pytest.mark.asyncio
+async def test_resolved_urls_are_cached(monkeypatch):
+    searcher, calls = _searcher_with_decoder(monkeypatch, "https://www.example.com/article")
+
+    assert await searcher._resolve_google_news_url(OPAQUE_URL) == "https://www.example.com/article"
+    assert await searcher._resolve_google_news_url(OPAQUE_URL) == "https://www.example.com/article"
+    assert calls == [OPAQUE_URL]
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_decode(monkeypatch):
+    searcher, calls = _searcher_with_decoder(monkeypatch, "https://www.example.com/article", delay=0.05)
+
+    resolved = await asyncio.gather(*(searcher._resolve_google_news_url(OPAQUE_URL) for _ in range(3)))
+
+    assert resolved == ["https://www.example.com/article"] * 3
+    assert calls == [OPAQUE_URL]
+
+@pytest.mark.asyncio
+async def test_failed_decodes_are_not_cached(monkeypatch):
+    searcher, calls = _searcher_with_decoder(monkeypatch, None)
+
+    # A failed decode falls back to the Google URL and is retried next time
+    assert await searcher._resolve_google_news_url(OPAQUE_URL) == OPAQUE_URL
+    assert await searcher._resolve_google_news_url(OPAQUE_URL) == OPAQUE_URL
+    assert calls == [OPAQUE_URL, OPAQUE_URL]
+    assert OPAQUE_URL not in searcher._url_cache
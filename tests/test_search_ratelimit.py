@@ -0,0 +1,65 @@
+import sys
+import time
+import asyncio
+import pathlib
+
+import pytest
+
+# Ensure src is on sys.path for direct imports when running from repo root
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from search.ratelimit import HostRateLimiter, TokenBucket
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_waits_for_refill():
+    bucket = TokenBucket(rate=2, period=0.2)
+
+    start = time.monotonic()
+    await bucket.acquire()
+    await bucket.acquire()
+    burst_elapsed = time.monotonic() - start
+
+    async with bucket:
+        pass
+    total_elapsed = time.monotonic() - start
+
+    assert burst_elapsed < 0.05
+    assert total_elapsed >= 0.09
+
+@pytest.mark.asyncio
+async def test_host_rate_limiter_caps_concurrent_requests():
+    limiter = HostRateLimiter(max_concurrent=2, rate=100, period=1.0)
+    active = 0
+    peak = 0
+
+    async def request(host):
+        nonlocal active, peak
+        async with limiter.limit(host):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(request(f"host-{i % 3}") for i in range(6)))
+
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_host_waiting_for_tokens_does_not_hold_slots():
+    limiter = HostRateLimiter(max_concurrent=1, rate=1, period=0.5)
+    finished: dict[str, float] = {}
+
+    async def request(name, host):
+        async with limiter.limit(host):
+            finished[name] = time.monotonic()
+
+    start = time.monotonic()
+    await request("slow-1", "slow.example")
+    # The second slow request waits ~0.5s for a token; the other host shouldn't wait behind it
+    await asyncio.gather(request("slow-2", "slow.example"), request("other", "other.example"))
+
+    assert finished["other"] - start < 0.2
+    assert finished["slow-2"] - start >= 0.4